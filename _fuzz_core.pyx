@@ -0,0 +1,135 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Optional Cython build of the fast evaluator in fuzzy_engine.py.
+
+Build in place next to the app with:
+
+    cythonize -i _fuzz_core.pyx
+
+The rule base is passed in as the same flattened arrays the numba kernels
+use, so RULES in fuzzy_engine.py stays the single definition.
+"""
+
+from libc.math cimport NAN
+
+cdef enum:
+    MAX_LEVELS = 8
+    MAX_LINES = 3 * MAX_LEVELS
+    MAX_XS = 2 + 3 * MAX_LEVELS + MAX_LINES * (MAX_LINES - 1) // 2
+
+
+cdef inline double trimf_scalar(double x, double a, double b, double c) noexcept nogil:
+    if x < a or x > c:
+        return 0.0
+    if x < b:
+        return (x - a) / (b - a)
+    if x > b:
+        return (c - x) / (c - b)
+    return 1.0
+
+
+cdef inline double aggregated_mf(double x, const double* strength, int n,
+                                 const double[:, ::1] distress_params) noexcept nogil:
+    cdef double agg = 0.0, cut
+    cdef int j
+    for j in range(n):
+        cut = trimf_scalar(x, distress_params[j, 0], distress_params[j, 1], distress_params[j, 2])
+        if strength[j] < cut:
+            cut = strength[j]
+        if cut > agg:
+            agg = cut
+    return agg
+
+
+cpdef double evaluate(const double[::1] inputs, const int[::1] rule_var_idx,
+                      const int[::1] rule_term_idx, const int[::1] rule_group_ptr,
+                      const int[::1] rule_consequent, const double[:, ::1] term_params,
+                      const double[:, ::1] distress_params, double lo, double hi) except? -1:
+    """Rule firing plus analytic centroid; NaN when no rule fires."""
+    cdef int n = distress_params.shape[0]
+    cdef double strength[MAX_LEVELS]
+    cdef double slope[MAX_LINES]
+    cdef double icept[MAX_LINES]
+    cdef double xs[MAX_XS]
+    cdef int r, k, j, i, out, n_lines = 0, n_xs = 0
+    cdef double fired, x, mu, h, a, b, c, x0, x1, y0, y1, dx, area, moment
+
+    if n > MAX_LEVELS:
+        raise ValueError(f"_fuzz_core supports at most {MAX_LEVELS} distress levels, got {n}; "
+                         "raise MAX_LEVELS and rebuild")
+    for j in range(n):
+        strength[j] = 0.0
+
+    # AND = min over each rule's terms, max-accumulated per consequent level
+    for r in range(rule_consequent.shape[0]):
+        fired = 1.0
+        for k in range(rule_group_ptr[r], rule_group_ptr[r + 1]):
+            # inputs are clipped to the universe, as scikit-fuzzy does
+            x = min(max(inputs[rule_var_idx[k]], lo), hi)
+            j = rule_term_idx[k]
+            mu = trimf_scalar(x, term_params[j, 0], term_params[j, 1], term_params[j, 2])
+            if mu < fired:
+                fired = mu
+        out = rule_consequent[r]
+        if fired > strength[out]:
+            strength[out] = fired
+
+    # Kinks of the aggregated output: vertices, cut points and crossings
+    xs[0] = lo
+    xs[1] = hi
+    n_xs = 2
+    for j in range(n):
+        h = strength[j]
+        if h <= 0.0:
+            continue
+        a = distress_params[j, 0]
+        b = distress_params[j, 1]
+        c = distress_params[j, 2]
+        xs[n_xs] = a
+        xs[n_xs + 1] = b
+        xs[n_xs + 2] = c
+        n_xs += 3
+        slope[n_lines] = 0.0
+        icept[n_lines] = h
+        n_lines += 1
+        if b > a:
+            slope[n_lines] = 1.0 / (b - a)
+            icept[n_lines] = -a / (b - a)
+            n_lines += 1
+        if c > b:
+            slope[n_lines] = -1.0 / (c - b)
+            icept[n_lines] = c / (c - b)
+            n_lines += 1
+    for i in range(n_lines):
+        for k in range(i + 1, n_lines):
+            if slope[i] != slope[k]:
+                x = (icept[k] - icept[i]) / (slope[i] - slope[k])
+                if lo < x < hi:
+                    xs[n_xs] = x
+                    n_xs += 1
+
+    # insertion sort: only a few dozen points
+    for i in range(1, n_xs):
+        x = xs[i]
+        k = i - 1
+        while k >= 0 and xs[k] > x:
+            xs[k + 1] = xs[k]
+            k -= 1
+        xs[k + 1] = x
+
+    # each piece between kinks is linear, so it integrates exactly
+    area = 0.0
+    moment = 0.0
+    x0 = xs[0]
+    y0 = aggregated_mf(x0, strength, n, distress_params)
+    for i in range(1, n_xs):
+        x1 = xs[i]
+        y1 = aggregated_mf(x1, strength, n, distress_params)
+        dx = x1 - x0
+        area += dx * (y0 + y1) / 2.0
+        moment += dx * (x0 * (2.0 * y0 + y1) + x1 * (y0 + 2.0 * y1)) / 6.0
+        x0 = x1
+        y0 = y1
+    if area == 0.0:
+        return NAN
+    return moment / area
@@ -0,0 +1,123 @@
+"""
+Ahead-of-time build of the fast evaluator with numba.pycc.
+
+Run once next to the app:
+
+    python build_fuzz_core.py
+
+This writes a fuzz_core extension module that fuzzy_engine.py imports
+instead of JIT-compiling its kernels on the first click. evaluate() takes
+the same flattened rule arrays as _fuzz_core.pyx, so RULES in
+fuzzy_engine.py stays the single definition.
+"""
+
+import os
+
+import numpy as np
+from numba import njit
+from numba.pycc import CC
+
+cc = CC('fuzz_core')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@njit
+def trimf_scalar(x, a, b, c):
+    if x < a or x > c:
+        return 0.0
+    if x < b:
+        return (x - a) / (b - a)
+    if x > b:
+        return (c - x) / (c - b)
+    return 1.0
+
+
+@njit
+def aggregated_mf(x, strength, distress_params):
+    agg = 0.0
+    for j in range(strength.shape[0]):
+        cut = min(trimf_scalar(x, distress_params[j, 0], distress_params[j, 1],
+                               distress_params[j, 2]), strength[j])
+        if cut > agg:
+            agg = cut
+    return agg
+
+
+@cc.export('evaluate', 'f8(f8[::1], i4[::1], i4[::1], i4[::1], i4[::1], f8[:, ::1], f8[:, ::1], f8, f8)')
+def evaluate(inputs, rule_var_idx, rule_term_idx, rule_group_ptr, rule_consequent,
+             term_params, distress_params, lo, hi):
+    """Rule firing plus analytic centroid; NaN when no rule fires."""
+    n = distress_params.shape[0]
+    strength = np.zeros(n)
+
+    # AND = min over each rule's terms, max-accumulated per consequent level
+    for r in range(rule_consequent.shape[0]):
+        fired = 1.0
+        for k in range(rule_group_ptr[r], rule_group_ptr[r + 1]):
+            # inputs are clipped to the universe, as scikit-fuzzy does
+            x = min(max(inputs[rule_var_idx[k]], lo), hi)
+            j = rule_term_idx[k]
+            mu = trimf_scalar(x, term_params[j, 0], term_params[j, 1], term_params[j, 2])
+            if mu < fired:
+                fired = mu
+        out = rule_consequent[r]
+        if fired > strength[out]:
+            strength[out] = fired
+
+    # Kinks of the aggregated output: vertices, cut points and crossings
+    slope = np.empty(3 * n)
+    icept = np.empty(3 * n)
+    xs = np.empty(3 * n + 3 * n * (3 * n - 1) // 2 + 2)
+    n_lines = 0
+    xs[0] = lo
+    xs[1] = hi
+    n_xs = 2
+    for j in range(n):
+        h = strength[j]
+        if h <= 0.0:
+            continue
+        a, b, c = distress_params[j, 0], distress_params[j, 1], distress_params[j, 2]
+        xs[n_xs] = a
+        xs[n_xs + 1] = b
+        xs[n_xs + 2] = c
+        n_xs += 3
+        slope[n_lines] = 0.0
+        icept[n_lines] = h
+        n_lines += 1
+        if b > a:
+            slope[n_lines] = 1.0 / (b - a)
+            icept[n_lines] = -a / (b - a)
+            n_lines += 1
+        if c > b:
+            slope[n_lines] = -1.0 / (c - b)
+            icept[n_lines] = c / (c - b)
+            n_lines += 1
+    for i in range(n_lines):
+        for k in range(i + 1, n_lines):
+            if slope[i] != slope[k]:
+                x = (icept[k] - icept[i]) / (slope[i] - slope[k])
+                if lo < x < hi:
+                    xs[n_xs] = x
+                    n_xs += 1
+
+    # each piece between kinks is linear, so it integrates exactly
+    xs = np.sort(xs[:n_xs])
+    area = 0.0
+    moment = 0.0
+    x0 = xs[0]
+    y0 = aggregated_mf(x0, strength, distress_params)
+    for i in range(1, n_xs):
+        x1 = xs[i]
+        y1 = aggregated_mf(x1, strength, distress_params)
+        dx = x1 - x0
+        area += dx * (y0 + y1) / 2.0
+        moment += dx * (x0 * (2.0 * y0 + y1) + x1 * (y0 + 2.0 * y1)) / 6.0
+        x0 = x1
+        y0 = y1
+    if area == 0.0:
+        return np.nan
+    return moment / area
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,118 @@
+"""
+Equivalence checks for the fast evaluators in fuzzy_engine.py.
+
+Run next to the app:
+
+    python check_equivalence.py
+
+Each check samples random inputs and compares against scikit-fuzzy or
+against the scalar evaluator. The script prints one line per check and
+exits non-zero if any of them misses its tolerance.
+"""
+
+import sys
+
+import numpy as np
+import skfuzzy as fuzz
+from skfuzzy import control as ctrl
+
+import fuzzy_engine as engine
+
+rng = np.random.default_rng(0)
+failures = []
+
+
+def report(name, value, ok):
+    print("%-58s %-10.4g %s" % (name, value, "ok" if ok else "FAIL"))
+    if not ok:
+        failures.append(name)
+
+
+def skfuzzy_simulation(rules, universe):
+    # One Rule per entry and sampled fuzz.defuzz centroid, like the
+    # original app; no OR-merging, no analytic centroid
+    antecedents = {}
+    for var in engine.VARIABLES:
+        antecedents[var] = ctrl.Antecedent(universe, var)
+        for lvl, params in engine.MF_PARAMS.items():
+            antecedents[var][lvl] = fuzz.trimf(universe, list(params))
+    distress = ctrl.Consequent(universe, 'distress')
+    for lvl, params in engine.DISTRESS_PARAMS.items():
+        distress[lvl] = fuzz.trimf(universe, list(params))
+
+    system_rules = []
+    for terms, out in rules:
+        antecedent = antecedents[terms[0][0]][terms[0][1]]
+        for var, lvl in terms[1:]:
+            antecedent = antecedent & antecedents[var][lvl]
+        system_rules.append(ctrl.Rule(antecedent, distress[out]))
+    return ctrl.ControlSystemSimulation(ctrl.ControlSystem(system_rules), flush_after_run=1)
+
+
+def skfuzzy_score(sim, x):
+    for var, val in zip(engine.VARIABLES, x):
+        sim.input[var] = float(val)
+    sim.compute()
+    return float(sim.output['distress'])
+
+
+def risk_level(scores):
+    # RISK_LEVELS index used by the UI
+    return (scores > 3).astype(int) + (scores > 7)
+
+
+# Fast evaluator vs the original scikit-fuzzy system (unpruned rules, u)
+X = rng.uniform(0, 10, (1000, len(engine.VARIABLES)))
+unpruned = skfuzzy_simulation(engine.UNPRUNED_RULES, engine.u)
+reference = np.array([skfuzzy_score(unpruned, x) for x in X])
+fast = np.array([engine.fast_distress(x) for x in X])
+err = np.abs(fast - reference).max()
+report("fast_distress vs scikit-fuzzy centroid", err, err <= 1e-3)
+
+# Pruning must not change inference at all
+pruned = skfuzzy_simulation(engine.RULES, engine.u)
+err = np.abs(np.array([skfuzzy_score(pruned, x) for x in X]) - reference).max()
+report("pruned vs unpruned rules (%d -> %d)" % (len(engine.UNPRUNED_RULES), len(engine.RULES)),
+       err, err <= 1e-9)
+
+# The O(1) defuzzifiers only need to agree on the displayed risk level.
+# triangle_centroid sits right around 99.5% depending on the sample, so it
+# gets a looser floor than weighted_average.
+X = rng.uniform(0, 10, (10000, len(engine.VARIABLES)))
+centroid = engine.fast_distress_batch(X, 'centroid_analytic')
+exact = risk_level(centroid)
+for method, floor in (('weighted_average', 0.995), ('triangle_centroid', 0.99)):
+    scores = engine.fast_distress_batch(X, method)
+    agreement = (risk_level(scores) == exact).mean()
+    report("%s risk-level agreement" % method, agreement, agreement >= floor)
+    # the displayed score still moves, which can change the advice bucket
+    shift = np.abs(scores - centroid)
+    report("%s mean score shift" % method, shift.mean(), shift.mean() <= 0.2)
+    report("%s max score shift" % method, shift.max(), shift.max() <= 1.0)
+
+# Batch evaluator vs scalar evaluator, every method
+X = rng.uniform(-1, 11, (2000, len(engine.VARIABLES)))
+for method in ('centroid_analytic', 'centroid', 'weighted_average', 'triangle_centroid'):
+    scalar = np.array([engine.fast_distress(x, method) for x in X])
+    err = np.abs(engine.fast_distress_batch(X, method) - scalar).max()
+    report("fast_distress_batch vs fast_distress (%s)" % method, err, err <= 1e-12)
+
+# Cython / pycc build vs the generated numba kernel, when one is installed
+if engine._fuzz_core is not None:
+    err = max(
+        abs(engine._score(x) - engine._checked(engine._defuzzify(
+            engine._fire_generated(x, np.empty(len(engine.DISTRESS_LEVELS))), 'centroid_analytic')))
+        for x in X
+    )
+    report("%s.evaluate vs numba kernel" % engine._fuzz_core.__name__, err, err <= 1e-12)
+
+# Slider-tick paths the UI caches on
+ticks = rng.integers(0, 101, (500, len(engine.VARIABLES)))
+fast = np.array([engine.fast_distress(t / 10.0) for t in ticks])
+err = np.abs(np.array([engine.distress_from_ticks(tuple(t)) for t in ticks]) - fast).max()
+report("distress_from_ticks vs fast_distress", err, err <= 1e-12)
+err = np.abs(np.array([engine.skfuzzy_distress(tuple(t)) for t in ticks]) - fast).max()
+report("skfuzzy_distress (u_sim) vs fast_distress", err, err <= 5e-3)
+
+if failures:
+    sys.exit("%d check(s) failed: %s" % (len(failures), ", ".join(failures)))
@@ -0,0 +1,579 @@
+"""
+Fuzzy inference engine behind streamlit_app.py.
+
+The rule base, the scikit-fuzzy ControlSystem and the fast evaluators live
+in this importable module rather than in the Streamlit script, because
+numba's on-disk cache re-imports the module a cached kernel was compiled
+in, and `streamlit run` executes the script as __main__.
+"""
+
+import functools
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import types
+
+import numpy as np
+import skfuzzy as fuzz
+from skfuzzy import control as ctrl
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    # optional Cython build of the fast evaluator, see _fuzz_core.pyx
+    import _fuzz_core
+except ImportError:
+    try:
+        # or the numba.pycc build from build_fuzz_core.py, same evaluate()
+        import fuzz_core as _fuzz_core
+    except ImportError:
+        _fuzz_core = None
+
+# ----------------- FUZZY VARIABLES -----------------
+# One read-only universe for the fast evaluator (scikit-fuzzy uses u_sim)
+u = np.linspace(0, 10, 101)
+u.setflags(write=False)
+
+VARIABLES = (
+    # Moods
+    'happiness', 'anxiety', 'sadness', 'irritability', 'calmness',
+    # Functioning
+    'stress', 'sleep_quality', 'energy', 'motivation', 'concentration',
+    # Behavior
+    'appetite', 'social', 'workload',
+)
+
+# Triangle breakpoints (a, b, c) shared by every antecedent / the consequent
+MF_PARAMS = {'low': (0, 0, 4), 'medium': (2, 5, 8), 'high': (6, 10, 10)}
+DISTRESS_PARAMS = {'low': (0, 0, 4), 'moderate': (3, 5, 7), 'high': (6, 10, 10)}
+
+# Antecedent memberships sampled on u once, shape (terms, len(u)) in
+# MF_PARAMS order. Every variable shares them, and u[i] is slider tick i,
+# so a slider value's memberships are the column MU[:, round(x * 10)].
+MU = np.stack([fuzz.trimf(u, list(params)) for params in MF_PARAMS.values()])
+MU.setflags(write=False)
+
+# ----------------- RULE BASE -----------------
+# Each rule is ([(variable, term), ...], distress_level); the terms are AND-ed.
+# The same table drives both the scikit-fuzzy system and fast_distress().
+RULES = [
+    # Complex multi-factor rules
+    ([('stress', 'high'), ('sleep_quality', 'low')], 'high'),
+    ([('anxiety', 'high'), ('concentration', 'low')], 'high'),
+    ([('sadness', 'high'), ('motivation', 'low'), ('social', 'low')], 'high'),
+    ([('workload', 'high'), ('energy', 'low'), ('stress', 'high')], 'high'),
+    ([('irritability', 'high'), ('sleep_quality', 'low'), ('stress', 'high')], 'high'),
+
+    ([('happiness', 'high'), ('calmness', 'high'), ('stress', 'low')], 'low'),
+    ([('energy', 'high'), ('motivation', 'high'), ('sleep_quality', 'high')], 'low'),
+
+    ([('anxiety', 'high'), ('sleep_quality', 'low')], 'moderate'),
+    ([('sadness', 'medium'), ('motivation', 'low')], 'moderate'),
+    # appetite low OR high: split in two, max-aggregation makes it equivalent
+    ([('appetite', 'low')], 'moderate'),
+    ([('appetite', 'high')], 'moderate'),
+]
+
+# Baseline rules for full coverage
+baseline = [
+    ('happiness', 'high', 'low'), ('happiness', 'low', 'moderate'),
+    ('anxiety', 'high', 'high'), ('anxiety', 'medium', 'moderate'),
+    ('sadness', 'high', 'high'), ('sadness', 'medium', 'moderate'),
+    ('irritability', 'high', 'high'), ('irritability', 'low', 'low'),
+    ('calmness', 'high', 'low'), ('calmness', 'low', 'moderate'),
+    ('stress', 'high', 'high'), ('stress', 'medium', 'moderate'),
+    ('sleep_quality', 'low', 'high'), ('sleep_quality', 'high', 'low'),
+    ('energy', 'low', 'high'), ('energy', 'high', 'low'),
+    ('motivation', 'low', 'high'), ('motivation', 'high', 'low'),
+    ('concentration', 'low', 'high'), ('concentration', 'high', 'low'),
+    ('appetite', 'low', 'moderate'), ('appetite', 'high', 'moderate'),
+    ('social', 'low', 'moderate'), ('social', 'high', 'low'),
+    ('workload', 'high', 'high'), ('workload', 'low', 'low'),
+]
+
+for var, lvl, out in baseline:
+    RULES.append(([(var, lvl)], out))
+
+def prune_rules(rules):
+    # Under max accumulation a rule is redundant when another rule with the
+    # same consequent uses a strict subset of its terms: min over more terms
+    # can never fire stronger. Exact duplicates keep their first occurrence.
+    keyed = [(frozenset(terms), out) for terms, out in rules]
+    pruned = []
+    for i, (terms, out) in enumerate(rules):
+        term_set = keyed[i][0]
+        dominated = any(
+            other_out == out and (other < term_set or (other == term_set and j < i))
+            for j, (other, other_out) in enumerate(keyed)
+        )
+        if not dominated:
+            pruned.append((terms, out))
+    return pruned
+
+# the full list is kept so check_equivalence.py can compare against it
+UNPRUNED_RULES = tuple(RULES)
+RULES = prune_rules(UNPRUNED_RULES)
+
+# ----------------- SCIKIT-FUZZY SYSTEM -----------------
+# scikit-fuzzy only needs a grid through the breakpoints (multiples of 0.25)
+u_sim = np.linspace(0, 10, 41)
+u_sim.setflags(write=False)
+MU_SIM = np.stack([fuzz.trimf(u_sim, list(params)) for params in MF_PARAMS.values()])
+MU_SIM.setflags(write=False)
+
+# Standard membership sets helper; every antecedent gets the same read-only
+# rows of MU_SIM instead of its own trimf arrays
+def add_lmh(ant):
+    for lvl, mf in zip(MF_PARAMS, MU_SIM):
+        ant[lvl] = mf
+
+# Built once per process instead of on every Streamlit rerun. Only the
+# ControlSystem is cached: a ControlSystemSimulation holds the input state,
+# so callers create a fresh one per assessment. scikit-fuzzy keeps that
+# per-simulation state on the shared Antecedent/Term nodes, so simulations
+# must be created with flush_after_run=1 to clear it after compute().
+@functools.lru_cache(maxsize=None)
+def build_control_system():
+    antecedents = {}
+    for var in VARIABLES:
+        antecedents[var] = ctrl.Antecedent(u_sim, var)
+        add_lmh(antecedents[var])
+
+    distress = ctrl.Consequent(u_sim, 'distress')
+    for lvl, params in DISTRESS_PARAMS.items():
+        distress[lvl] = fuzz.trimf(distress.universe, list(params))
+
+    # Single-term rules sharing a consequent become one OR-ed rule. With max
+    # accumulation that is the same inference, but compute() walks 4 Rule
+    # objects instead of 27.
+    rules = []
+    merged = {}
+    for terms, out in RULES:
+        antecedent = antecedents[terms[0][0]][terms[0][1]]
+        if len(terms) == 1:
+            merged[out] = merged[out] | antecedent if out in merged else antecedent
+            continue
+        for var, lvl in terms[1:]:
+            antecedent = antecedent & antecedents[var][lvl]
+        rules.append(ctrl.Rule(antecedent, distress[out]))
+    rules.extend(ctrl.Rule(antecedent, distress[out]) for out, antecedent in merged.items())
+
+    return ctrl.ControlSystem(rules)
+
+# ----------------- FAST EVALUATOR -----------------
+# Closed-form Mamdani inference over the same rule base, without the
+# scikit-fuzzy graph walk.
+
+# Defuzzification (check_equivalence.py measures each against the centroid):
+#   'centroid_analytic'  exact centroid of the clipped output trapezoids
+#   'centroid'           centroid of the aggregated output sampled on u
+#   'weighted_average'   DISTRESS_PEAKS averaged by firing strength, O(1)
+#   'triangle_centroid'  unclipped triangle centroids by strength x area, O(1)
+DEFUZZ_METHOD = 'centroid_analytic'
+
+TERMS = tuple(MF_PARAMS)
+DISTRESS_LEVELS = tuple(DISTRESS_PARAMS)
+# representative centre of each distress level for 'weighted_average'
+DISTRESS_PEAKS = {'low': 2.0, 'moderate': 5.0, 'high': 8.0}
+
+# Rule base flattened CSR-style: the terms of rule r are
+# _RULE_VAR[_RULE_PTR[r]:_RULE_PTR[r + 1]] / _RULE_TERM[...]
+_RULE_VAR = np.array([VARIABLES.index(var) for terms, _ in RULES for var, _ in terms], dtype=np.int32)
+_RULE_TERM = np.array([TERMS.index(lvl) for terms, _ in RULES for _, lvl in terms], dtype=np.int32)
+_RULE_PTR = np.cumsum([0] + [len(terms) for terms, _ in RULES]).astype(np.int32)
+_RULE_OUT = np.array([DISTRESS_LEVELS.index(out) for _, out in RULES], dtype=np.int32)
+_TERM_PARAMS = np.array([MF_PARAMS[lvl] for lvl in TERMS], dtype=np.float64)
+
+# Consequent membership functions sampled on u once, one row per
+# DISTRESS_LEVELS entry; read-only since every evaluation shares them
+_DISTRESS_MF = np.stack([fuzz.trimf(u, list(DISTRESS_PARAMS[lvl])) for lvl in DISTRESS_LEVELS])
+_DISTRESS_MF.setflags(write=False)
+_DISTRESS_PARAMS = np.array([DISTRESS_PARAMS[lvl] for lvl in DISTRESS_LEVELS], dtype=np.float64)
+_DISTRESS_PEAKS = np.array([DISTRESS_PEAKS[lvl] for lvl in DISTRESS_LEVELS], dtype=np.float64)
+# closed-form centroid and area of each unclipped consequent triangle
+_DISTRESS_CENTROIDS = _DISTRESS_PARAMS.sum(axis=1) / 3.0
+_DISTRESS_AREAS = (_DISTRESS_PARAMS[:, 2] - _DISTRESS_PARAMS[:, 0]) / 2.0
+
+@njit(cache=True)
+def trimf_scalar(x, a, b, c):
+    if x < a or x > c:
+        return 0.0
+    if x < b:
+        return (x - a) / (b - a)
+    if x > b:
+        return (c - x) / (c - b)
+    return 1.0
+
+@njit(cache=True, fastmath=True)
+def _centroid_sampled(strength, u, distress_mf):
+    # Clip, aggregate and defuzzify by centroid in a single pass over u
+    num = 0.0
+    den = 0.0
+    for i in range(u.shape[0]):
+        agg = 0.0
+        for j in range(strength.shape[0]):
+            cut = min(distress_mf[j, i], strength[j])
+            if cut > agg:
+                agg = cut
+        num += u[i] * agg
+        den += agg
+    if den == 0.0:
+        return np.nan
+    return num / den
+
+@njit(cache=True)
+def _weighted_average(strength, peaks):
+    num = 0.0
+    den = 0.0
+    for j in range(strength.shape[0]):
+        num += strength[j] * peaks[j]
+        den += strength[j]
+    if den == 0.0:
+        return np.nan
+    return num / den
+
+@njit(cache=True)
+def _triangle_centroid(strength, centroids, areas):
+    num = 0.0
+    den = 0.0
+    for j in range(strength.shape[0]):
+        w = strength[j] * areas[j]
+        num += w * centroids[j]
+        den += w
+    if den == 0.0:
+        return np.nan
+    return num / den
+
+@njit(cache=True)
+def _aggregated_mf(x, strength, distress_params):
+    agg = 0.0
+    for j in range(strength.shape[0]):
+        p = distress_params[j]
+        cut = min(trimf_scalar(x, p[0], p[1], p[2]), strength[j])
+        if cut > agg:
+            agg = cut
+    return agg
+
+@njit(cache=True)
+def _centroid_analytic(strength, distress_params, lo, hi):
+    # The aggregated output is piecewise linear: each clipped triangle is a
+    # trapezoid made of a rising edge, a flat cut and a falling edge. Between
+    # consecutive kinks (vertices, cut points and crossings of any two of
+    # those lines) each piece integrates exactly, so no sampling is needed.
+    n = strength.shape[0]
+    slope = np.empty(3 * n)
+    icept = np.empty(3 * n)
+    xs = np.empty(3 * n + 3 * n * (3 * n - 1) // 2 + 2)
+    n_lines = 0
+    n_xs = 0
+    xs[n_xs] = lo
+    xs[n_xs + 1] = hi
+    n_xs += 2
+    for j in range(n):
+        h = strength[j]
+        if h <= 0.0:
+            continue
+        a, b, c = distress_params[j, 0], distress_params[j, 1], distress_params[j, 2]
+        xs[n_xs] = a
+        xs[n_xs + 1] = b
+        xs[n_xs + 2] = c
+        n_xs += 3
+        slope[n_lines] = 0.0
+        icept[n_lines] = h
+        n_lines += 1
+        if b > a:
+            slope[n_lines] = 1.0 / (b - a)
+            icept[n_lines] = -a / (b - a)
+            n_lines += 1
+        if c > b:
+            slope[n_lines] = -1.0 / (c - b)
+            icept[n_lines] = c / (c - b)
+            n_lines += 1
+    for i in range(n_lines):
+        for k in range(i + 1, n_lines):
+            if slope[i] != slope[k]:
+                x = (icept[k] - icept[i]) / (slope[i] - slope[k])
+                if lo < x < hi:
+                    xs[n_xs] = x
+                    n_xs += 1
+
+    xs = np.sort(xs[:n_xs])
+    area = 0.0
+    moment = 0.0
+    x0 = xs[0]
+    y0 = _aggregated_mf(x0, strength, distress_params)
+    for i in range(1, n_xs):
+        x1 = xs[i]
+        y1 = _aggregated_mf(x1, strength, distress_params)
+        dx = x1 - x0
+        area += dx * (y0 + y1) / 2.0
+        moment += dx * (x0 * (2.0 * y0 + y1) + x1 * (y0 + 2.0 * y1)) / 6.0
+        x0 = x1
+        y0 = y1
+    if area == 0.0:
+        return np.nan
+    return moment / area
+
+# ----------------- GENERATED EVALUATOR -----------------
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+
+# The rule base is fixed at import, so rule firing is specialised into
+# straight-line code instead of walking the _RULE_* arrays: one clipped
+# input per variable, each needed membership once, then min per rule and
+# max per consequent level, all against constants. The source is written
+# under __pycache__ keyed by a hash of the rule base so numba's on-disk
+# cache can pick it up.
+def _generate_fire_source(rules):
+    lines = ["def fire(inputs_arr, out):"]
+    for i, var in enumerate(VARIABLES):
+        lines.append("    x%d = min(max(inputs_arr[%d], %r), %r)  # %s" % (i, i, float(u[0]), float(u[-1]), var))
+    mus = {}
+    for terms, _ in rules:
+        for var, lvl in terms:
+            if (var, lvl) not in mus:
+                mus[(var, lvl)] = "m%d" % len(mus)
+                a, b, c = (float(p) for p in MF_PARAMS[lvl])
+                lines.append("    %s = trimf_scalar(x%d, %r, %r, %r)"
+                             % (mus[(var, lvl)], VARIABLES.index(var), a, b, c))
+    by_level = {lvl: [] for lvl in DISTRESS_LEVELS}
+    for r, (terms, out) in enumerate(rules):
+        names = [mus[term] for term in terms]
+        lines.append("    r%d = %s" % (r, names[0] if len(names) == 1 else "min(%s)" % ", ".join(names)))
+        by_level[out].append("r%d" % r)
+    for j, lvl in enumerate(DISTRESS_LEVELS):
+        fired = by_level[lvl]
+        if not fired:
+            value = "0.0"
+        elif len(fired) == 1:
+            value = fired[0]
+        else:
+            value = "max(%s)" % ", ".join(fired)
+        lines.append("    out[%d] = %s  # %s" % (j, value, lvl))
+    lines.append("    return out")
+    return "\n".join(lines) + "\n"
+
+def build_evaluator(rules):
+    """Return an njit-compiled fire(inputs_arr, out) specialised to rules."""
+    src = _generate_fire_source(rules)
+    name = "_generated_fire_" + hashlib.sha1(src.encode()).hexdigest()[:16]
+    path = os.path.join(_CACHE_DIR, name + ".py")
+    try:
+        if not os.path.exists(path):
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            # a private temp file per process, so concurrent first starts
+            # never write into each other's copy before the rename
+            fd, tmp = tempfile.mkstemp(prefix=name, suffix=".tmp", dir=_CACHE_DIR)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(src)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+    except OSError:
+        # read-only checkout: still works, just without numba's disk cache
+        namespace = {"__name__": name, "trimf_scalar": trimf_scalar}
+        exec(compile(src, "<generated fire>", "exec"), namespace)
+        return njit(fastmath=True)(namespace["fire"])
+    # registered as a real module so numba can find it again when loading
+    # its cached machine code
+    module = sys.modules.get(name)
+    if module is None:
+        module = types.ModuleType(name)
+        module.__file__ = path
+        module.trimf_scalar = trimf_scalar
+        exec(compile(src, path, "exec"), module.__dict__)
+        sys.modules[name] = module
+    return njit(cache=True, fastmath=True)(module.fire)
+
+_fire_generated = build_evaluator(RULES)
+
+def _defuzzify(strength, defuzz):
+    if defuzz == 'centroid_analytic':
+        return _centroid_analytic(strength, _DISTRESS_PARAMS, u[0], u[-1])
+    if defuzz == 'centroid':
+        return _centroid_sampled(strength, u, _DISTRESS_MF)
+    if defuzz == 'weighted_average':
+        return _weighted_average(strength, _DISTRESS_PEAKS)
+    if defuzz == 'triangle_centroid':
+        return _triangle_centroid(strength, _DISTRESS_CENTROIDS, _DISTRESS_AREAS)
+    raise ValueError("Unknown defuzzification method: " + str(defuzz))
+
+def _checked(score):
+    if np.isnan(score):
+        raise ValueError("No rules fired for these inputs, distress is undefined.")
+    return float(score)
+
+def _score(inputs_arr, defuzz=None):
+    defuzz = defuzz or DEFUZZ_METHOD
+    if defuzz == 'centroid_analytic' and _fuzz_core is not None:
+        score = _fuzz_core.evaluate(inputs_arr, _RULE_VAR, _RULE_TERM, _RULE_PTR, _RULE_OUT,
+                                    _TERM_PARAMS, _DISTRESS_PARAMS, u[0], u[-1])
+    else:
+        strength = _fire_generated(inputs_arr, np.empty(len(DISTRESS_LEVELS)))
+        score = _defuzzify(strength, defuzz)
+    return _checked(score)
+
+def _as_inputs(values, dtype):
+    # The compiled kernels index the vector unchecked and take contiguous
+    # arrays only, so the shape is validated here
+    arr = np.ascontiguousarray(values, dtype=dtype)
+    if arr.shape != (len(VARIABLES),):
+        raise ValueError("Expected %d inputs, one per entry of VARIABLES." % len(VARIABLES))
+    return arr
+
+def fast_distress(inputs_arr, defuzz=None):
+    # inputs_arr holds one crisp value per entry of VARIABLES, in that order
+    return _score(_as_inputs(inputs_arr, np.float64), defuzz)
+
+# ----------------- BATCH EVALUATOR -----------------
+# Same inference for an (..., len(VARIABLES)) array of assessments in one
+# numpy pass, for sweeps and offline validation. Leading axes are kept, so
+# a (N, 13) array gives N scores and a grid of scenarios gives a grid.
+# Rows where no rule fires come back as NaN instead of raising.
+def trimf_array(x, a, b, c):
+    rise = (x - a) / (b - a) if b > a else np.where(x >= a, 1.0, 0.0)
+    fall = (c - x) / (c - b) if c > b else np.where(x <= c, 1.0, 0.0)
+    return np.clip(np.minimum(rise, fall), 0.0, 1.0)
+
+# Rule base as a (rules, variables) matrix of term indices, -1 where a rule
+# does not look at a variable. Rows are ordered by consequent, so each
+# level's rules are one contiguous block of rows.
+_BATCH_ORDER = np.argsort(_RULE_OUT, kind='stable')
+_RULE_MATRIX = np.full((len(RULES), len(VARIABLES)), -1, dtype=np.int32)
+for _row, _r in enumerate(_BATCH_ORDER):
+    _terms = slice(_RULE_PTR[_r], _RULE_PTR[_r + 1])
+    _RULE_MATRIX[_row, _RULE_VAR[_terms]] = _RULE_TERM[_terms]
+_RULE_MATRIX.setflags(write=False)
+# Per variable: the rows that use it and the term each of them tests
+_BATCH_COLUMNS = [
+    (np.flatnonzero(col >= 0), col[col >= 0]) for col in _RULE_MATRIX.T
+]
+# Row block [start, stop) of each level; empty when no rule concludes it
+_BATCH_LEVEL_ROWS = np.searchsorted(_RULE_OUT[_BATCH_ORDER], np.arange(len(DISTRESS_LEVELS) + 1))
+
+@njit(cache=True)
+def _centroid_analytic_batch(strengths, distress_params, lo, hi):
+    out = np.empty(strengths.shape[0])
+    for n in range(strengths.shape[0]):
+        out[n] = _centroid_analytic(strengths[n], distress_params, lo, hi)
+    return out
+
+def fast_distress_batch(X, defuzz=None):
+    X = np.clip(np.asarray(X, dtype=np.float64), u[0], u[-1])
+    if X.ndim == 0 or X.shape[-1] != len(VARIABLES):
+        raise ValueError("Expected an (..., %d) array of inputs." % len(VARIABLES))
+    batch_shape = X.shape[:-1]
+    X = X.reshape(-1, len(VARIABLES))
+
+    # memberships, shape (variables, terms, N)
+    mu = np.stack([trimf_array(X.T, *MF_PARAMS[lvl]) for lvl in TERMS], axis=1)
+
+    # (rules, N) firing strengths, AND-ed in one sweep over the variables
+    # (don't-cares stay at 1.0), then (levels, N) by max per consequent
+    fired = np.ones((len(RULES), X.shape[0]))
+    for var_idx, (rows, term_idx) in enumerate(_BATCH_COLUMNS):
+        if rows.size:
+            fired[rows] = np.minimum(fired[rows], mu[var_idx, term_idx])
+    # a level without rules stays at 0, as in the scalar evaluator
+    strength = np.zeros((len(DISTRESS_LEVELS), X.shape[0]))
+    for j, (start, stop) in enumerate(zip(_BATCH_LEVEL_ROWS[:-1], _BATCH_LEVEL_ROWS[1:])):
+        if stop > start:
+            strength[j] = fired[start:stop].max(axis=0)
+
+    return _defuzzify_batch(strength, defuzz or DEFUZZ_METHOD).reshape(batch_shape)
+
+def _defuzzify_batch(strength, defuzz):
+    # strength has shape (levels, N)
+    if defuzz == 'centroid_analytic':
+        return _centroid_analytic_batch(np.ascontiguousarray(strength.T),
+                                        _DISTRESS_PARAMS, u[0], u[-1])
+    if defuzz == 'centroid':
+        agg = np.minimum(_DISTRESS_MF[:, None, :], strength[:, :, None]).max(axis=0)
+        area = agg.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(area > 0, agg @ u / area, np.nan)
+    if defuzz == 'weighted_average':
+        total = strength.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total > 0, _DISTRESS_PEAKS @ strength / total, np.nan)
+    if defuzz == 'triangle_centroid':
+        total = _DISTRESS_AREAS @ strength
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total > 0, (_DISTRESS_AREAS * _DISTRESS_CENTROIDS) @ strength / total, np.nan)
+    raise ValueError("Unknown defuzzification method: " + str(defuzz))
+
+# ----------------- SLIDER TICKS -----------------
+# Slider values are whole ticks of 0.1, so on the UI path every antecedent
+# membership is a column of MU. Min and max only pick among their
+# arguments, so the rules fire on small codes for MU's distinct values
+# (stored in the narrowest unsigned type) and each level's winning code
+# maps back through _TICK_LEVELS. Rounded so that equal fractions from
+# different triangles share one code.
+_TICK_LEVELS = np.unique(np.round(MU, 12))
+_TICK_CODE = np.searchsorted(_TICK_LEVELS, np.round(MU, 12)).astype(
+    np.min_scalar_type(len(_TICK_LEVELS) - 1))
+for _table in (_TICK_LEVELS, _TICK_CODE):
+    _table.setflags(write=False)
+
+@njit(cache=True)
+def _fire_ticks(ticks, rule_var_idx, rule_term_idx, rule_group_ptr, rule_consequent,
+                tick_code, tick_levels, n_levels):
+    best = np.zeros(n_levels, dtype=np.int64)
+    last = tick_code.shape[1] - 1
+    for r in range(rule_consequent.shape[0]):
+        fired = tick_levels.shape[0] - 1
+        for k in range(rule_group_ptr[r], rule_group_ptr[r + 1]):
+            q = min(max(ticks[rule_var_idx[k]], 0), last)
+            code = tick_code[rule_term_idx[k], q]
+            if code < fired:
+                fired = code
+        out = rule_consequent[r]
+        if fired > best[out]:
+            best[out] = fired
+    strength = np.empty(n_levels)
+    for j in range(n_levels):
+        strength[j] = tick_levels[best[j]]
+    return strength
+
+# Slider ticks (value * 10) are the UI's cache key. The Cython / pycc
+# evaluate() takes crisp values, so it gets them when installed; otherwise
+# the rules fire from the tick table.
+def distress_from_ticks(ticks):
+    if DEFUZZ_METHOD == 'centroid_analytic' and _fuzz_core is not None:
+        return _score(_as_inputs(ticks, np.float64) / 10.0)
+    strength = _fire_ticks(_as_inputs(ticks, np.int64), _RULE_VAR, _RULE_TERM, _RULE_PTR,
+                           _RULE_OUT, _TICK_CODE, _TICK_LEVELS, len(DISTRESS_LEVELS))
+    return _checked(_defuzzify(strength, DEFUZZ_METHOD))
+
+@functools.lru_cache(maxsize=None)
+def _system_antecedents():
+    # the control system's Antecedent nodes, ordered like VARIABLES
+    nodes = {n.label: n for n in build_control_system().graph.nodes()
+             if isinstance(n, ctrl.Antecedent)}
+    return tuple(nodes[var] for var in VARIABLES)
+
+# Inputs and intermediate results live on those shared nodes, so concurrent
+# sessions must not interleave between setting inputs and reading the output
+_SYSTEM_LOCK = threading.Lock()
+
+def skfuzzy_distress(ticks):
+    distress_sim = ctrl.ControlSystemSimulation(build_control_system(), flush_after_run=1)
+    with _SYSTEM_LOCK:
+        # distress_sim.input[key] = value without its per-key graph rescan
+        # (scikit-fuzzy 0.4.2); ticks are always inside u_sim, so no clipping
+        for antecedent, tick in zip(_system_antecedents(), ticks):
+            antecedent.input['current'] = tick / 10.0
+        distress_sim._update_unique_id()
+        distress_sim.input._update_to_current()
+        distress_sim.compute()
+        return float(distress_sim.output['distress'])
@@ -326,212 +326,163 @@
 Fuzzy Mental Health Assessment
 """
 
+import bisect
+import functools
+import re
+
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
 import streamlit as st
 
+from fuzzy_engine import VARIABLES, distress_from_ticks, skfuzzy_distress
+
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional: keyword_emergency_check() falls back to a regex
+    ahocorasick = None
+
 # ----------------- HELPERS -----------------
+KEYWORDS = (
+    "suicide", "kill myself", "killing myself", "suicidal", "hurt myself",
+    "no point", "hopeless", "die", "death", "kill me"
+)
+# stronger triggers that indicate immediate concern
+EMERGENCY_TRIGGERS = frozenset(
+    {"suicide", "kill myself", "killing myself", "suicidal", "hurt myself", "kill me"}
+)
+
+# One pass over the text for all keywords. Longest alternatives go first so
+# "kill myself" wins over "kill me"; only the start of a match is anchored to
+# a word boundary so inflections like "suicides" or "died" still match.
+_KEYWORD_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(KEYWORDS, key=len, reverse=True))) + r")",
+    re.IGNORECASE,
+)
+
+# Aho-Corasick automaton over the same keywords: a single linear pass whose
+# per-character cost does not grow with the number of keywords
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for kw in KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(kw, kw)
+    _KEYWORD_AUTOMATON.make_automaton()
+
+def _match_keywords(text):
+    if ahocorasick is None:
+        return {m.group(1).lower() for m in _KEYWORD_RE.finditer(text)}
+    txt = text.lower()
+    # keep the regex's leading word boundary: the character before a match
+    # (at index end - len(kw)) must not be part of a word
+    return {
+        kw for end, kw in _KEYWORD_AUTOMATON.iter(txt)
+        if end < len(kw) or not (txt[end - len(kw)].isalnum() or txt[end - len(kw)] == '_')
+    }
+
 def keyword_emergency_check(text):
     if not text:
         return False, []
-    txt = text.lower()
-    keywords = [
-        "suicide", "kill myself", "killing myself", "suicidal", "hurt myself",
-        "no point", "hopeless", "die", "death", "kill me"
-    ]
-    found = [k for k in keywords if k in txt]
-    # stronger triggers that indicate immediate concern
-    emergency_triggers = ["suicide", "kill myself", "killing myself", "suicidal", "hurt myself", "kill me"]
-    is_emergency = any(k in txt for k in emergency_triggers)
+    matched = _match_keywords(text)
+    found = [k for k in KEYWORDS if k in matched]
+    is_emergency = not EMERGENCY_TRIGGERS.isdisjoint(matched)
     return is_emergency, found
 
-# ----------------- IMPROVED RECOMMENDATIONS -----------------
-def generate_recommendations(score, patterns, crisis_trigger=False):
-    recommendations = []
-
-    # ------------------------------------
-    # SCORE-BASED INTERPRETATION
-    # ------------------------------------
-    if score is None:
-        recommendations.append("Unable to compute distress score.")
-        return recommendations
-
-    if score <= 2:
-        recommendations.append(
-            "Your distress level appears low. Maintain healthy routines such as consistent sleep, hydration, and regular movement."
-        )
-
-    elif 2 < score <= 4:
-        recommendations.append(
-            "Your distress is mild. A short self-care break, a walk, or light breathing exercises can help stabilize your emotional state."
-        )
-
-    elif 4 < score <= 6:
-        recommendations.append(
-            "Your distress is moderate. Consider structured breaks, reducing workload temporarily, and practicing grounding techniques. Prioritize tasks and avoid overstimulation."
-        )
-
-    elif 6 < score <= 8:
-        recommendations.append(
-            "Your distress is high. It may help to slow down, reduce commitments where possible, and talk to a trusted person or counselor. Mindfulness and relaxation exercises can help significantly."
-        )
-
-    else:  # score > 8
-        recommendations.append(
-            "Your distress is very high. Please seek emotional support immediately—reach out to a mental health professional or someone you trust. Avoid isolation and practice grounding exercises."
-        )
-
-    # ------------------------------------
-    # PATTERN-BASED ANALYSIS
-    # ------------------------------------
-    if patterns:
-
-        if "Appetite Change" in patterns:
-            recommendations.append(
-                "- Appetite changes detected. Try maintaining consistent meals and hydration. If this persists for more than a week, consider consulting a healthcare professional."
-            )
-
-        if "Sleep Irregularity" in patterns:
-            recommendations.append(
-                "- Sleep irregularities noted. Aim for a stable sleep-wake schedule and reduce late-night screen use."
-            )
-
-        if "Low Motivation" in patterns:
-            recommendations.append(
-                "- Low motivation observed. Break tasks into very small steps and acknowledge small achievements. Behavioral activation can help boost momentum."
-            )
-
-        if "Anxiety Indicators" in patterns:
-            recommendations.append(
-                "- Anxiety patterns detected. Try slow breathing exercises (4-4-6 method) or grounding techniques like the 5-4-3-2-1 sensory tool."
-            )
-
-        if "Social Withdrawal" in patterns:
-            recommendations.append(
-                "- Reduced social interaction detected. A short conversation with a familiar person can help stabilize emotional state."
-            )
-
-        if "Irritability Spike" in patterns:
-            recommendations.append(
-                "- Increased irritability detected. Short pauses, hydration, and stepping outside briefly can reduce overstimulation."
-            )
+# ----------------- PATTERN DETECTION -----------------
+# (pattern, input, low_thr, high_thr): flagged when value <= low or >= high
+_ANY = np.nextafter(0.0, 1.0)  # ">= _ANY" means "> 0"
+PATTERN_DEFS = (
+    ("Appetite Change", 'appetite', 3, 8),
+    ("Sleep Irregularity", 'sleep_quality', 4, np.inf),
+    ("Low Motivation", 'motivation', 3, np.inf),
+    ("Anxiety Indicators", 'anxiety', -np.inf, 6),
+    ("Social Withdrawal", 'social', 2, np.inf),
+    ("Irritability Spike", 'irritability', -np.inf, 6),
+    ("Low Energy Pattern", 'energy', 3, np.inf),
+    # Suicide-related patterns
+    ("Suicidal Ideation", 'suicidal', -np.inf, _ANY),
+    ("Self-harm Thoughts", 'selfharm', -np.inf, _ANY),
+)
+PATTERN_NAMES = tuple(name for name, _, _, _ in PATTERN_DEFS)
+PATTERN_INPUTS = tuple(var for _, var, _, _ in PATTERN_DEFS)
+_PATTERN_LOW = np.array([low for _, _, low, _ in PATTERN_DEFS], dtype=np.float64)
+_PATTERN_HIGH = np.array([high for _, _, _, high in PATTERN_DEFS], dtype=np.float64)
+
+def detect_patterns(values):
+    vals = np.array([values[var] for var in PATTERN_INPUTS], dtype=np.float64)
+    mask = (vals <= _PATTERN_LOW) | (vals >= _PATTERN_HIGH)
+    return [PATTERN_NAMES[i] for i in np.flatnonzero(mask)]
 
-        if "Low Energy Pattern" in patterns:
-            recommendations.append(
-                "- Low energy levels identified. Light stretching, hydration, and stepping outside for sunlight can boost alertness."
-            )
-
-        if "Suicidal Ideation" in patterns:
-            recommendations.append(
-                "- Suicidal thoughts detected. You deserve immediate support. Consider reaching out to someone you trust, a crisis line, or local emergency services. If you are in immediate danger, call your local emergency number."
-            )
+# ----------------- IMPROVED RECOMMENDATIONS -----------------
+# Upper bounds (inclusive) of the recommendation score buckets
+SCORE_BUCKETS = (2, 4, 6, 8)
+
+def _score_bucket(score):
+    return bisect.bisect_left(SCORE_BUCKETS, score)
+
+# Risk level banners, indexed by (score > 3) + (score > 7)
+RISK_LEVELS = (
+    (st.success, "Risk Level: LOW"),
+    (st.warning, "Risk Level: MODERATE"),
+    (st.error, "Risk Level: HIGH"),
+)
+
+# Score-based interpretation, indexed by _score_bucket()
+_SCORE_MSGS = (
+    "Your distress level appears low. Maintain healthy routines such as consistent sleep, hydration, and regular movement.",
+    "Your distress is mild. A short self-care break, a walk, or light breathing exercises can help stabilize your emotional state.",
+    "Your distress is moderate. Consider structured breaks, reducing workload temporarily, and practicing grounding techniques. Prioritize tasks and avoid overstimulation.",
+    "Your distress is high. It may help to slow down, reduce commitments where possible, and talk to a trusted person or counselor. Mindfulness and relaxation exercises can help significantly.",
+    "Your distress is very high. Please seek emotional support immediately—reach out to a mental health professional or someone you trust. Avoid isolation and practice grounding exercises.",
+)
+
+# Pattern-based analysis, in the order the advice is listed
+_PATTERN_MSGS = {
+    "Appetite Change": "- Appetite changes detected. Try maintaining consistent meals and hydration. If this persists for more than a week, consider consulting a healthcare professional.",
+    "Sleep Irregularity": "- Sleep irregularities noted. Aim for a stable sleep-wake schedule and reduce late-night screen use.",
+    "Low Motivation": "- Low motivation observed. Break tasks into very small steps and acknowledge small achievements. Behavioral activation can help boost momentum.",
+    "Anxiety Indicators": "- Anxiety patterns detected. Try slow breathing exercises (4-4-6 method) or grounding techniques like the 5-4-3-2-1 sensory tool.",
+    "Social Withdrawal": "- Reduced social interaction detected. A short conversation with a familiar person can help stabilize emotional state.",
+    "Irritability Spike": "- Increased irritability detected. Short pauses, hydration, and stepping outside briefly can reduce overstimulation.",
+    "Low Energy Pattern": "- Low energy levels identified. Light stretching, hydration, and stepping outside for sunlight can boost alertness.",
+    "Suicidal Ideation": "- Suicidal thoughts detected. You deserve immediate support. Consider reaching out to someone you trust, a crisis line, or local emergency services. If you are in immediate danger, call your local emergency number.",
+    "Self-harm Thoughts": "- Self-harm thoughts detected. Please prioritize immediate safety: avoid being alone if possible, remove access to means, and contact a trusted person or professional.",
+}
+
+# Crisis-specific: additional urgent, non-directive guidance
+_CRISIS_MSG = "- You are showing signs of significant distress. If thoughts of harming yourself are present or intensifying, contact local emergency services or a crisis helpline right away. If possible, stay with someone you trust while you seek help."
+
+def _recommendations(bucket, patterns, crisis_trigger):
+    recommendations = [_SCORE_MSGS[bucket]]
+    recommendations.extend(msg for name, msg in _PATTERN_MSGS.items() if name in patterns)
+    if crisis_trigger:
+        recommendations.append(_CRISIS_MSG)
+    return tuple(recommendations)
 
-        if "Self-harm Thoughts" in patterns:
-            recommendations.append(
-                "- Self-harm thoughts detected. Please prioritize immediate safety: avoid being alone if possible, remove access to means, and contact a trusted person or professional."
-            )
+# The text only depends on (score bucket, pattern set, crisis flag), so it is
+# memoized; st.cache_resource keeps the lru_cache alive across reruns.
+@st.cache_resource
+def _cached_recommendations():
+    return functools.lru_cache(maxsize=4096)(_recommendations)
 
-    # ------------------------------------
-    # CRISIS-SPECIFIC
-    # ------------------------------------
-    if crisis_trigger:
-        # Additional urgent, non-directive guidance
-        recommendations.append(
-            "- You are showing signs of significant distress. If thoughts of harming yourself are present or intensifying, contact local emergency services or a crisis helpline right away. If possible, stay with someone you trust while you seek help."
-        )
-
-    # ------------------------------------
-    # GENERAL FALLBACK
-    # ------------------------------------
-    if not recommendations:
-        recommendations.append(
-            "No concerning patterns detected, but maintaining balanced sleep, hydration, nutrition, and movement is always beneficial."
-        )
-
-    return recommendations
-
-# ----------------- FUZZY VARIABLES -----------------
-u = np.linspace(0, 10, 101)
-
-# Moods
-happiness = ctrl.Antecedent(u, 'happiness')
-anxiety = ctrl.Antecedent(u, 'anxiety')
-sadness = ctrl.Antecedent(u, 'sadness')
-irritability = ctrl.Antecedent(u, 'irritability')
-calmness = ctrl.Antecedent(u, 'calmness')
-
-# Functioning
-stress = ctrl.Antecedent(u, 'stress')
-sleep_quality = ctrl.Antecedent(u, 'sleep_quality')
-energy = ctrl.Antecedent(u, 'energy')
-motivation = ctrl.Antecedent(u, 'motivation')
-concentration = ctrl.Antecedent(u, 'concentration')
-
-# Behavior
-appetite = ctrl.Antecedent(u, 'appetite')
-social = ctrl.Antecedent(u, 'social')
-workload = ctrl.Antecedent(u, 'workload')
-
-# Consequent
-distress = ctrl.Consequent(u, 'distress')
-distress['low'] = fuzz.trimf(distress.universe, [0, 0, 4])
-distress['moderate'] = fuzz.trimf(distress.universe, [3, 5, 7])
-distress['high'] = fuzz.trimf(distress.universe, [6, 10, 10])
-
-# Standard membership sets helper
-def add_lmh(ant):
-    ant['low'] = fuzz.trimf(ant.universe, [0, 0, 4])
-    ant['medium'] = fuzz.trimf(ant.universe, [2, 5, 8])
-    ant['high'] = fuzz.trimf(ant.universe, [6, 10, 10])
-
-for ant in [
-    happiness, anxiety, sadness, irritability, calmness,
-    stress, sleep_quality, energy, motivation, concentration,
-    appetite, social, workload
-]:
-    add_lmh(ant)
-
-# ----------------- RULE BASE -----------------
-rules = []
-
-# Complex multi-factor rules
-rules.append(ctrl.Rule(stress['high'] & sleep_quality['low'], distress['high']))
-rules.append(ctrl.Rule(anxiety['high'] & concentration['low'], distress['high']))
-rules.append(ctrl.Rule(sadness['high'] & motivation['low'] & social['low'], distress['high']))
-rules.append(ctrl.Rule(workload['high'] & energy['low'] & stress['high'], distress['high']))
-rules.append(ctrl.Rule(irritability['high'] & sleep_quality['low'] & stress['high'], distress['high']))
-
-rules.append(ctrl.Rule(happiness['high'] & calmness['high'] & stress['low'], distress['low']))
-rules.append(ctrl.Rule(energy['high'] & motivation['high'] & sleep_quality['high'], distress['low']))
-
-rules.append(ctrl.Rule(anxiety['high'] & sleep_quality['low'], distress['moderate']))
-rules.append(ctrl.Rule(sadness['medium'] & motivation['low'], distress['moderate']))
-rules.append(ctrl.Rule(appetite['low'] | appetite['high'], distress['moderate']))
-
-# Baseline rules for full coverage
-baseline = [
-    (happiness, 'high', 'low'), (happiness, 'low', 'moderate'),
-    (anxiety, 'high', 'high'), (anxiety, 'medium', 'moderate'),
-    (sadness, 'high', 'high'), (sadness, 'medium', 'moderate'),
-    (irritability, 'high', 'high'), (irritability, 'low', 'low'),
-    (calmness, 'high', 'low'), (calmness, 'low', 'moderate'),
-    (stress, 'high', 'high'), (stress, 'medium', 'moderate'),
-    (sleep_quality, 'low', 'high'), (sleep_quality, 'high', 'low'),
-    (energy, 'low', 'high'), (energy, 'high', 'low'),
-    (motivation, 'low', 'high'), (motivation, 'high', 'low'),
-    (concentration, 'low', 'high'), (concentration, 'high', 'low'),
-    (appetite, 'low', 'moderate'), (appetite, 'high', 'moderate'),
-    (social, 'low', 'moderate'), (social, 'high', 'low'),
-    (workload, 'high', 'high'), (workload, 'low', 'low'),
-]
-
-for ant, lvl, out in baseline:
-    rules.append(ctrl.Rule(ant[lvl], distress[out]))
-
-# Build control system
-distress_ctrl = ctrl.ControlSystem(rules)
-distress_sim = ctrl.ControlSystemSimulation(distress_ctrl)
+def generate_recommendations(score, patterns, crisis_trigger=False):
+    if score is None:
+        return ["Unable to compute distress score."]
+    recs = _cached_recommendations()(_score_bucket(score), frozenset(patterns), bool(crisis_trigger))
+    return list(recs)
+
+# ----------------- FUZZY ENGINE -----------------
+# Rule base and evaluators live in fuzzy_engine.py. Set USE_FAST_ENGINE =
+# False to fall back to the scikit-fuzzy simulation.
+USE_FAST_ENGINE = True
+
+# Memoized on slider ticks (value * 10), the sliders' own 0.1 resolution,
+# for either engine. Users mostly move one slider at a time, so the working
+# set stays small. The lru_cache is held by st.cache_resource so it survives
+# reruns; a plain module-level one would be rebuilt each time Streamlit
+# re-executes the script.
+@st.cache_resource
+def _cached_distress(use_fast_engine=True):
+    compute = distress_from_ticks if use_fast_engine else skfuzzy_distress
+    return functools.lru_cache(maxsize=8192)(compute)
 
 # ----------------- STREAMLIT UI -----------------
 st.set_page_config(page_title="Fuzzy Mental Health Assessment", layout="wide")
@@ -542,45 +493,49 @@ Move the sliders to reflect your current emotional and functional state.
 Then press **Run Fuzzy Assessment**.
 """)
 
-col1, col2 = st.columns(2)
-
-with col1:
-    st.header("Mood & Affect")
-    happiness_val = st.slider("Happiness", 0.0, 10.0, 0.0, 0.1)
-    anxiety_val = st.slider("Anxiety", 0.0, 10.0, 0.0, 0.1)
-    sadness_val = st.slider("Sadness", 0.0, 10.0, 0.0, 0.1)
-    irritability_val = st.slider("Irritability", 0.0, 10.0, 0.0, 0.1)
-    calmness_val = st.slider("Calmness", 0.0, 10.0, 0.0, 0.1)
-
-with col2:
-    st.header("Functioning & Behavior")
-    stress_val = st.slider("Stress", 0.0, 10.0, 0.0, 0.1)
-    sleep_val = st.slider("Sleep quality", 0.0, 10.0, 0.0, 0.1)
-    energy_val = st.slider("Energy", 0.0, 10.0, 0.0, 0.1)
-    motivation_val = st.slider("Motivation", 0.0, 10.0, 0.0, 0.1)
-    concentration_val = st.slider("Concentration", 0.0, 10.0, 0.0, 0.1)
-
-st.header("Other Factors")
-col3, col4, col5 = st.columns(3)
-with col3:
-    appetite_val = st.slider("Appetite normality", 0.0, 10.0, 0.0, 0.1)
-with col4:
-    social_val = st.slider("Social activity", 0.0, 10.0, 0.0, 0.1)
-with col5:
-    workload_val = st.slider("Workload pressure", 0.0, 10.0, 0.0, 0.1)
-
-st.header("Safety-related Factors")
-col_s1, col_s2 = st.columns(2)
-with col_s1:
-    suicidal_val = st.slider("Suicidal thoughts (0 = none, 10 = frequent/intense)", 0.0, 10.0, 0.0, 0.1)
-with col_s2:
-    selfharm_val = st.slider("Self-harm thoughts (0 = none, 10 = frequent/intense)", 0.0, 10.0, 0.0, 0.1)
-
-st.header("Free text (optional)")
-free_text = st.text_area("Enter any details you'd like the system to consider:")
+# Inputs are collected in a form, so moving a slider does not rerun the
+# script; everything below runs once per submit
+with st.form("assessment_form"):
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.header("Mood & Affect")
+        happiness_val = st.slider("Happiness", 0.0, 10.0, 0.0, 0.1)
+        anxiety_val = st.slider("Anxiety", 0.0, 10.0, 0.0, 0.1)
+        sadness_val = st.slider("Sadness", 0.0, 10.0, 0.0, 0.1)
+        irritability_val = st.slider("Irritability", 0.0, 10.0, 0.0, 0.1)
+        calmness_val = st.slider("Calmness", 0.0, 10.0, 0.0, 0.1)
+
+    with col2:
+        st.header("Functioning & Behavior")
+        stress_val = st.slider("Stress", 0.0, 10.0, 0.0, 0.1)
+        sleep_val = st.slider("Sleep quality", 0.0, 10.0, 0.0, 0.1)
+        energy_val = st.slider("Energy", 0.0, 10.0, 0.0, 0.1)
+        motivation_val = st.slider("Motivation", 0.0, 10.0, 0.0, 0.1)
+        concentration_val = st.slider("Concentration", 0.0, 10.0, 0.0, 0.1)
+
+    st.header("Other Factors")
+    col3, col4, col5 = st.columns(3)
+    with col3:
+        appetite_val = st.slider("Appetite normality", 0.0, 10.0, 0.0, 0.1)
+    with col4:
+        social_val = st.slider("Social activity", 0.0, 10.0, 0.0, 0.1)
+    with col5:
+        workload_val = st.slider("Workload pressure", 0.0, 10.0, 0.0, 0.1)
+
+    st.header("Safety-related Factors")
+    col_s1, col_s2 = st.columns(2)
+    with col_s1:
+        suicidal_val = st.slider("Suicidal thoughts (0 = none, 10 = frequent/intense)", 0.0, 10.0, 0.0, 0.1)
+    with col_s2:
+        selfharm_val = st.slider("Self-harm thoughts (0 = none, 10 = frequent/intense)", 0.0, 10.0, 0.0, 0.1)
+
+    st.header("Free text (optional)")
+    free_text = st.text_area("Enter any details you'd like the system to consider:")
+    submitted = st.form_submit_button("Run Fuzzy Assessment")
 
 # ----------------- RUN -----------------
-if st.button("Run Fuzzy Assessment"):
+if submitted:
 
     # Emergency screening (free text)
     is_emg, found = keyword_emergency_check(free_text)
@@ -593,33 +548,26 @@ if st.button("Run Fuzzy Assessment"):
         if found:
             st.write("Keywords found in text:", found)
 
-    # Fuzzy inputs (crisp)
-    inputs = {
-        'happiness': happiness_val,
-        'anxiety': anxiety_val,
-        'sadness': sadness_val,
-        'irritability': irritability_val,
-        'calmness': calmness_val,
-        'stress': stress_val,
-        'sleep_quality': sleep_val,
-        'energy': energy_val,
-        'motivation': motivation_val,
-        'concentration': concentration_val,
-        'appetite': appetite_val,
-        'social': social_val,
-        'workload': workload_val
-    }
-
-    for key, val in inputs.items():
-        distress_sim.input[key] = val
-
-    # Compute fuzzy distress
-    try:
-        distress_sim.compute()
-        score = float(distress_sim.output['distress'])
-    except Exception as e:
-        st.error("Fuzzy computation error: " + str(e))
-        score = None
+    # Fuzzy inputs (crisp), ordered like VARIABLES
+    inputs_key = (
+        happiness_val, anxiety_val, sadness_val, irritability_val, calmness_val,
+        stress_val, sleep_val, energy_val, motivation_val, concentration_val,
+        appetite_val, social_val, workload_val,
+    )
+
+    # Compute fuzzy distress; a repeated click with unchanged sliders reuses
+    # the score kept in session_state
+    if st.session_state.get('_last_inputs') == inputs_key:
+        score = st.session_state['_last_score']
+    else:
+        try:
+            ticks = tuple(int(round(val * 10)) for val in inputs_key)
+            score = _cached_distress(USE_FAST_ENGINE)(ticks)
+            st.session_state['_last_inputs'] = inputs_key
+            st.session_state['_last_score'] = score
+        except Exception as e:
+            st.error("Fuzzy computation error: " + str(e))
+            score = None
 
     # ----------------- CRISIS OVERRIDE LOGIC -----------------
     crisis_trigger = False
@@ -644,54 +592,22 @@ if st.button("Run Fuzzy Assessment"):
     if score is not None:
         st.write("### Final Distress Score:", round(score, 2))
 
-        if score <= 3:
-            st.success("Risk Level: LOW")
-        elif score <= 7:
-            st.warning("Risk Level: MODERATE")
-        else:
-            st.error("Risk Level: HIGH")
+        show, label = RISK_LEVELS[(score > 3) + (score > 7)]
+        show(label)
 
         # ----------------- PATTERN DETECTION -----------------
-        patterns = []
-
-        if appetite_val <= 3 or appetite_val >= 8:
-            patterns.append("Appetite Change")
-
-        if sleep_val <= 4:
-            patterns.append("Sleep Irregularity")
-
-        if motivation_val <= 3:
-            patterns.append("Low Motivation")
-
-        if anxiety_val >= 6:
-            patterns.append("Anxiety Indicators")
-
-        if social_val <= 2:
-            patterns.append("Social Withdrawal")
-
-        if irritability_val >= 6:
-            patterns.append("Irritability Spike")
-
-        if energy_val <= 3:
-            patterns.append("Low Energy Pattern")
-
-        # Suicide-related patterns
-        if suicidal_val > 0:
-            patterns.append("Suicidal Ideation")
-        if selfharm_val > 0:
-            patterns.append("Self-harm Thoughts")
+        patterns = detect_patterns(dict(zip(VARIABLES, inputs_key),
+                                            suicidal=suicidal_val, selfharm=selfharm_val))
 
-        st.write("### Detected Patterns:")
-        if patterns:
-            st.write(patterns)
-        else:
-            st.write("No significant patterns detected.")
+        # each section goes out as one markdown element instead of one
+        # element per line
+        st.markdown("### Detected Patterns:\n" + (
+            "\n".join("- " + p for p in patterns) or "No significant patterns detected."
+        ))
 
         # ----------------- RECOMMENDATIONS -----------------
-        st.write("### Recommendations")
         recs = generate_recommendations(score, patterns, crisis_trigger=crisis_trigger)
-        for r in recs:
-            st.write("- " + r)
+        st.markdown("### Recommendations\n" + "\n".join("- " + r for r in recs))
 
         # Crisis-mode extra guidance (non-directive, safety focused)
         if crisis_trigger: